@@ -4,74 +4,109 @@ import (
 	"context"
 	"encoding/base64"
 	"encoding/json"
-	"log"
+	"errors"
+	"log/slog"
 	"net/http"
 	"strings"
 
 	"github.com/aws/aws-lambda-go/events"
 	"github.com/aws/aws-lambda-go/lambda"
+	"github.com/aws/aws-sdk-go-v2/aws"
 	"github.com/aws/aws-sdk-go-v2/service/sqs"
 	"github.com/google/uuid"
 
 	"memory-machine/internal/config"
+	"memory-machine/internal/logging"
 	"memory-machine/internal/models"
 )
 
+// maxBodyBytes caps the request body so oversized requests are rejected
+// before any decoding or parsing. It is a cheap first filter only: JSON
+// escaping can grow the text, so the encoded message is checked separately
+// against maxMessageBytes.
+const maxBodyBytes = 200 * 1024
+
+// maxMessageBytes is the SQS message size limit (256 KiB).
+const maxMessageBytes = 256 * 1024
+
+// settings and sqsClient are resolved once per container in main; settingsErr
+// is reported on every request so a misconfigured deployment still answers
+// with a 500.
+var (
+	settings    config.IngestSettings
+	settingsErr error
+	sqsClient   messageSender
+)
+
+// messageSender is the part of the SQS client the handler uses, so the
+// container-wide client can be replaced with a fake.
+type messageSender interface {
+	SendMessage(ctx context.Context, params *sqs.SendMessageInput, optFns ...func(*sqs.Options)) (*sqs.SendMessageOutput, error)
+}
+
 func main() {
+	logging.Setup()
+	// Generated log IDs draw from a buffered pool of crypto/rand bytes
+	// instead of one read per ID. Must be enabled before handlers run.
+	uuid.EnableRandPool()
+	settings, settingsErr = config.LoadIngest(context.Background())
+	if settingsErr == nil {
+		sqsClient = sqs.NewFromConfig(settings.AWSConfig)
+	}
 	lambda.Start(handleRequest)
 }
 
 func handleRequest(ctx context.Context, req events.APIGatewayV2HTTPRequest) (events.APIGatewayV2HTTPResponse, error) {
-	settings, err := config.Load(ctx)
-	if err != nil {
-		log.Printf("configuration error: %v", err)
+	if settingsErr != nil {
+		slog.Error("configuration error", "error", settingsErr)
 		return errorResponse(http.StatusInternalServerError, "internal configuration error"), nil
 	}
 
-	body := req.Body
+	// Reject oversized bodies before decoding or parsing them. For base64
+	// bodies the decoded size is computed from the encoded length.
+	bodyLen := len(req.Body)
+	if req.IsBase64Encoded {
+		bodyLen = base64DecodedLen(req.Body)
+	}
+	if bodyLen > maxBodyBytes {
+		return errorResponse(http.StatusRequestEntityTooLarge, "payload too large"), nil
+	}
+
+	contentType, _, _ := strings.Cut(req.Headers["content-type"], ";")
+	parse, ok := bodyParsers[strings.ToLower(strings.TrimSpace(contentType))]
+	if !ok {
+		return errorResponse(http.StatusBadRequest, "unsupported Content-Type. Use application/json or text/plain."), nil
+	}
+
+	// A base64 body is decoded once and kept as bytes; a plain body stays a
+	// string. Each parser converts to the form it needs at most once.
+	var decoded []byte
 	if req.IsBase64Encoded {
-		decoded, decodeErr := base64.StdEncoding.DecodeString(req.Body)
+		var decodeErr error
+		decoded, decodeErr = base64.StdEncoding.DecodeString(req.Body)
 		if decodeErr != nil {
 			return errorResponse(http.StatusBadRequest, "invalid base64 body"), nil
 		}
-		body = string(decoded)
 	}
 
-	contentType := strings.ToLower(strings.TrimSpace(strings.Split(req.Headers["content-type"], ";")[0]))
+	message, parseErr := parse(req, decoded)
+	if parseErr != nil {
+		return errorResponse(http.StatusBadRequest, parseErr.Error()), nil
+	}
 
-	var message models.InternalMessage
-	switch contentType {
-	case "application/json":
-		var payload models.JSONIngestRequest
-		if err := json.Unmarshal([]byte(body), &payload); err != nil {
-			return errorResponse(http.StatusBadRequest, "invalid JSON payload"), nil
-		}
-		if payload.TenantID == "" || payload.Text == "" {
-			return errorResponse(http.StatusBadRequest, "tenant_id and text are required"), nil
-		}
-		logID := payload.LogID
-		if logID == "" {
-			logID = uuid.NewString()
-		}
-		message = models.NewInternalMessage(payload.TenantID, logID, "json_upload", payload.Text)
-	case "text/plain":
-		tenant := req.Headers["x-tenant-id"]
-		if tenant == "" {
-			return errorResponse(http.StatusBadRequest, "missing X-Tenant-ID header"), nil
-		}
-		message = models.NewInternalMessage(tenant, uuid.NewString(), "text_upload", body)
-	default:
-		return errorResponse(http.StatusBadRequest, "unsupported Content-Type. Use application/json or text/plain."), nil
+	// Escaping can make the queued JSON several times larger than the body,
+	// so check the encoded message itself before SQS rejects it.
+	messageBody := message.QueueBody()
+	if len(messageBody) > maxMessageBytes {
+		return errorResponse(http.StatusRequestEntityTooLarge, "payload too large"), nil
 	}
 
-	client := sqs.NewFromConfig(settings.AWSConfig)
-	messageBody, _ := json.Marshal(message)
-	_, err = client.SendMessage(ctx, &sqs.SendMessageInput{
+	_, err := sqsClient.SendMessage(ctx, &sqs.SendMessageInput{
 		QueueUrl:    &settings.SQSQueueURL,
-		MessageBody: stringPtr(string(messageBody)),
+		MessageBody: aws.String(messageBody),
 	})
 	if err != nil {
-		log.Printf("failed to enqueue message: %v", err)
+		slog.Error("failed to enqueue message", "error", err)
 		return errorResponse(http.StatusInternalServerError, "failed to enqueue message"), nil
 	}
 
@@ -80,29 +115,85 @@ func handleRequest(ctx context.Context, req events.APIGatewayV2HTTPRequest) (eve
 		TenantID: message.TenantID,
 		LogID:    message.LogID,
 	}
-	payload, _ := json.Marshal(resp)
 
 	return events.APIGatewayV2HTTPResponse{
 		StatusCode: http.StatusAccepted,
-		Body:       string(payload),
-		Headers: map[string]string{
-			"content-type": "application/json",
-		},
+		Body:       resp.Body(),
+		Headers:    jsonHeaders,
 	}, nil
 }
 
+// jsonHeaders is shared by every response; it is only ever read.
+var jsonHeaders = map[string]string{
+	"content-type": "application/json",
+}
+
+// base64DecodedLen returns the decoded size of a padded base64 string without
+// decoding it. DecodedLen alone counts the '=' padding as data.
+func base64DecodedLen(s string) int {
+	n := base64.StdEncoding.DecodedLen(len(s))
+	switch {
+	case strings.HasSuffix(s, "=="):
+		n -= 2
+	case strings.HasSuffix(s, "="):
+		n--
+	}
+	return n
+}
+
+// bodyParser normalizes a request body of one content type. decoded holds the
+// body when the request is base64 encoded. A returned error is reported to
+// the client as a 400 with the error text.
+type bodyParser func(req events.APIGatewayV2HTTPRequest, decoded []byte) (models.InternalMessage, error)
+
+var bodyParsers = map[string]bodyParser{
+	"application/json": parseJSONBody,
+	"text/plain":       parseTextBody,
+}
+
+// Parser errors are fixed values so rejecting a request allocates nothing.
+var (
+	errInvalidJSON     = errors.New("invalid JSON payload")
+	errMissingFields   = errors.New("tenant_id and text are required")
+	errMissingTenantID = errors.New("missing X-Tenant-ID header")
+)
+
+func parseJSONBody(req events.APIGatewayV2HTTPRequest, decoded []byte) (models.InternalMessage, error) {
+	data := decoded
+	if !req.IsBase64Encoded {
+		data = []byte(req.Body)
+	}
+	var payload models.JSONIngestRequest
+	if err := json.Unmarshal(data, &payload); err != nil {
+		return models.InternalMessage{}, errInvalidJSON
+	}
+	if payload.TenantID == "" || payload.Text == "" {
+		return models.InternalMessage{}, errMissingFields
+	}
+	logID := payload.LogID
+	if logID == "" {
+		logID = uuid.NewString()
+	}
+	return models.NewInternalMessage(payload.TenantID, logID, "json_upload", payload.Text), nil
+}
+
+func parseTextBody(req events.APIGatewayV2HTTPRequest, decoded []byte) (models.InternalMessage, error) {
+	tenant := req.Headers["x-tenant-id"]
+	if tenant == "" {
+		return models.InternalMessage{}, errMissingTenantID
+	}
+	text := req.Body
+	if req.IsBase64Encoded {
+		text = string(decoded)
+	}
+	return models.NewInternalMessage(tenant, uuid.NewString(), "text_upload", text), nil
+}
+
 func errorResponse(code int, msg string) events.APIGatewayV2HTTPResponse {
-	body, _ := json.Marshal(map[string]string{"error": msg})
 	return events.APIGatewayV2HTTPResponse{
 		StatusCode: code,
-		Body:       string(body),
-		Headers: map[string]string{
-			"content-type": "application/json",
-		},
+		Body:       models.ErrorResponse{Error: msg}.Body(),
+		Headers:    jsonHeaders,
 	}
 }
 
-func stringPtr(s string) *string {
-	return &s
-}
-
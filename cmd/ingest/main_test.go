@@ -0,0 +1,176 @@
+package main
+
+import (
+	"context"
+	"encoding/base64"
+	"encoding/json"
+	"net/http"
+	"strings"
+	"sync"
+	"testing"
+
+	"github.com/aws/aws-lambda-go/events"
+	"github.com/aws/aws-sdk-go-v2/aws"
+	"github.com/aws/aws-sdk-go-v2/service/sqs"
+
+	"memory-machine/internal/config"
+	"memory-machine/internal/models"
+)
+
+// fakeSender records SendMessage calls.
+type fakeSender struct {
+	mu    sync.Mutex
+	calls []*sqs.SendMessageInput
+}
+
+func (f *fakeSender) SendMessage(ctx context.Context, params *sqs.SendMessageInput, optFns ...func(*sqs.Options)) (*sqs.SendMessageOutput, error) {
+	f.mu.Lock()
+	defer f.mu.Unlock()
+	f.calls = append(f.calls, params)
+	return &sqs.SendMessageOutput{}, nil
+}
+
+// useFakeSQS points the container-wide state at a fake client for the
+// duration of a test.
+func useFakeSQS(t *testing.T, fake *fakeSender) {
+	t.Helper()
+	oldSettings, oldErr, oldClient := settings, settingsErr, sqsClient
+	settings = config.IngestSettings{SQSQueueURL: "https://sqs.example/queue"}
+	settingsErr, sqsClient = nil, fake
+	t.Cleanup(func() {
+		settings, settingsErr, sqsClient = oldSettings, oldErr, oldClient
+	})
+}
+
+func textRequest(body string, base64Encoded bool) events.APIGatewayV2HTTPRequest {
+	if base64Encoded {
+		body = base64.StdEncoding.EncodeToString([]byte(body))
+	}
+	return events.APIGatewayV2HTTPRequest{
+		Headers:         map[string]string{"content-type": "text/plain", "x-tenant-id": "acme"},
+		Body:            body,
+		IsBase64Encoded: base64Encoded,
+	}
+}
+
+func TestBase64DecodedLen(t *testing.T) {
+	lengths := []int{0, 1, 2, 3, 4, 5}
+	for n := maxBodyBytes - 4; n <= maxBodyBytes+4; n++ {
+		lengths = append(lengths, n)
+	}
+	for _, n := range lengths {
+		encoded := base64.StdEncoding.EncodeToString(make([]byte, n))
+		if got := base64DecodedLen(encoded); got != n {
+			t.Errorf("base64DecodedLen(encoding of %d bytes) = %d", n, got)
+		}
+	}
+}
+
+func TestHandleRequestEnqueuesMessage(t *testing.T) {
+	fake := &fakeSender{}
+	useFakeSQS(t, fake)
+
+	for _, base64Encoded := range []bool{false, true} {
+		resp, err := handleRequest(context.Background(), textRequest("User 555-0199 accessed system", base64Encoded))
+		if err != nil {
+			t.Fatalf("handleRequest: %v", err)
+		}
+		if resp.StatusCode != http.StatusAccepted {
+			t.Fatalf("status = %d (%s), want 202", resp.StatusCode, resp.Body)
+		}
+	}
+
+	if len(fake.calls) != 2 {
+		t.Fatalf("SendMessage called %d times, want 2", len(fake.calls))
+	}
+	for _, input := range fake.calls {
+		if got := aws.ToString(input.QueueUrl); got != settings.SQSQueueURL {
+			t.Errorf("QueueUrl = %q, want %q", got, settings.SQSQueueURL)
+		}
+		var message models.InternalMessage
+		if err := json.Unmarshal([]byte(aws.ToString(input.MessageBody)), &message); err != nil {
+			t.Fatalf("queued body is not JSON: %v", err)
+		}
+		if message.TenantID != "acme" || message.Text != "User 555-0199 accessed system" {
+			t.Errorf("queued message = %+v", message)
+		}
+	}
+}
+
+func TestHandleRequestRejectsOversizedPayloads(t *testing.T) {
+	tests := []struct {
+		name          string
+		body          string
+		base64Encoded bool
+		want          int
+	}{
+		{"body at cap", strings.Repeat("a", maxBodyBytes), false, http.StatusAccepted},
+		{"body over cap", strings.Repeat("a", maxBodyBytes+1), false, http.StatusRequestEntityTooLarge},
+		{"base64 body at cap", strings.Repeat("a", maxBodyBytes), true, http.StatusAccepted},
+		{"base64 body over cap", strings.Repeat("a", maxBodyBytes+1), true, http.StatusRequestEntityTooLarge},
+		// Each control byte escapes to six bytes (\u0001), so a body well
+		// under maxBodyBytes still exceeds maxMessageBytes once queued.
+		{"escapes past SQS limit", strings.Repeat("\x01", maxMessageBytes/6+1), false, http.StatusRequestEntityTooLarge},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			fake := &fakeSender{}
+			useFakeSQS(t, fake)
+
+			resp, err := handleRequest(context.Background(), textRequest(tt.body, tt.base64Encoded))
+			if err != nil {
+				t.Fatalf("handleRequest: %v", err)
+			}
+			if resp.StatusCode != tt.want {
+				t.Fatalf("status = %d (%s), want %d", resp.StatusCode, resp.Body, tt.want)
+			}
+			wantCalls := 0
+			if tt.want == http.StatusAccepted {
+				wantCalls = 1
+			}
+			if len(fake.calls) != wantCalls {
+				t.Fatalf("SendMessage called %d times, want %d", len(fake.calls), wantCalls)
+			}
+			for _, input := range fake.calls {
+				if n := len(aws.ToString(input.MessageBody)); n > maxMessageBytes {
+					t.Errorf("queued %d bytes, over the %d byte SQS limit", n, maxMessageBytes)
+				}
+			}
+		})
+	}
+}
+
+func TestHandleRequestRejectsInvalidBodies(t *testing.T) {
+	tests := []struct {
+		name    string
+		headers map[string]string
+		body    string
+		want    error
+	}{
+		{"invalid JSON", map[string]string{"content-type": "application/json"}, "{", errInvalidJSON},
+		{"missing text", map[string]string{"content-type": "application/json"}, `{"tenant_id":"acme"}`, errMissingFields},
+		{"missing tenant", map[string]string{"content-type": "text/plain"}, "hello", errMissingTenantID},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			fake := &fakeSender{}
+			useFakeSQS(t, fake)
+
+			req := events.APIGatewayV2HTTPRequest{Headers: tt.headers, Body: tt.body}
+			resp, err := handleRequest(context.Background(), req)
+			if err != nil {
+				t.Fatalf("handleRequest: %v", err)
+			}
+			if resp.StatusCode != http.StatusBadRequest {
+				t.Fatalf("status = %d, want 400", resp.StatusCode)
+			}
+			if want := (models.ErrorResponse{Error: tt.want.Error()}).Body(); resp.Body != want {
+				t.Errorf("body = %s, want %s", resp.Body, want)
+			}
+			if len(fake.calls) != 0 {
+				t.Errorf("SendMessage called %d times, want 0", len(fake.calls))
+			}
+		})
+	}
+}
+
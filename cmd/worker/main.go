@@ -5,60 +5,131 @@ import (
 	"encoding/json"
 	"errors"
 	"fmt"
-	"log"
+	"log/slog"
 	"math/rand"
-	"regexp"
+	"sync"
 	"time"
 
 	"github.com/aws/aws-lambda-go/events"
 	"github.com/aws/aws-lambda-go/lambda"
+	"github.com/aws/aws-sdk-go-v2/aws"
 	"github.com/aws/aws-sdk-go-v2/service/dynamodb"
 	"github.com/aws/aws-sdk-go-v2/service/dynamodb/types"
 
 	"memory-machine/internal/config"
+	"memory-machine/internal/logging"
 	"memory-machine/internal/models"
 )
 
-var phonePattern = regexp.MustCompile(`\b\d{3}-\d{4}\b`)
+// settings and db are resolved once per container in main rather than per
+// event, so warm invocations reuse the client and its connection pool.
+var (
+	settings    config.WorkerSettings
+	settingsErr error
+	db          itemPutter
+)
+
+// itemPutter is the part of the DynamoDB client the worker uses, so the
+// container-wide client can be replaced with a fake.
+type itemPutter interface {
+	PutItem(ctx context.Context, params *dynamodb.PutItemInput, optFns ...func(*dynamodb.Options)) (*dynamodb.PutItemOutput, error)
+}
+
+// stored remembers the keys this container has already persisted, so
+// redeliveries of the same message are acknowledged without a DynamoDB call.
+var stored = newRecentKeys(maxRecentKeys)
+
+// notExistsCondition makes PutItem reject an item that is already stored,
+// which keeps redelivered messages idempotent.
+var notExistsCondition = aws.String("attribute_not_exists(tenant_id) AND attribute_not_exists(log_id)")
+
+// maxConcurrentRecords bounds how many records of a batch are written at
+// once, so raising the SQS batch size does not fan out unbounded requests.
+// It matches the SDK HTTP client's default of 10 idle connections per host,
+// so every concurrent write reuses a kept-alive connection on warm starts.
+const maxConcurrentRecords = 10
 
 func main() {
-	rand.Seed(time.Now().UnixNano())
+	logging.Setup()
+	settings, settingsErr = config.LoadWorker(context.Background())
+	if settingsErr == nil {
+		db = dynamodb.NewFromConfig(settings.AWSConfig)
+	}
 	lambda.Start(handleSQSEvent)
 }
 
-func handleSQSEvent(ctx context.Context, event events.SQSEvent) error {
-	settings, err := config.Load(ctx)
-	if err != nil {
-		log.Printf("configuration error: %v", err)
-		return err
+func handleSQSEvent(ctx context.Context, event events.SQSEvent) (events.SQSEventResponse, error) {
+	if settingsErr != nil {
+		slog.Error("configuration error", "error", settingsErr)
+		return events.SQSEventResponse{}, settingsErr
 	}
-	db := dynamodb.NewFromConfig(settings.AWSConfig)
 
-	for _, record := range event.Records {
-		if err := processRecord(ctx, db, settings, record); err != nil {
-			return err
+	// processed_at has second resolution and SQS delivers a batch within
+	// moments, so the timestamp is formatted once and its attribute value is
+	// shared, read-only, by every record's item. Simulate builds restamp each
+	// record after its sleep instead; see processRecord.
+	processedAt := newProcessedAt()
+
+	// Each record costs a DynamoDB round-trip, so the batch is written
+	// concurrently. PutItem is used rather than BatchWriteItem because only
+	// PutItem carries the ConditionExpression that keeps retries idempotent.
+	errs := make([]error, len(event.Records))
+	sem := make(chan struct{}, maxConcurrentRecords)
+	var wg sync.WaitGroup
+	for i, record := range event.Records {
+		wg.Add(1)
+		sem <- struct{}{}
+		go func(i int, record events.SQSMessage) {
+			defer func() {
+				<-sem
+				wg.Done()
+			}()
+			errs[i] = processRecord(ctx, db, record, processedAt)
+		}(i, record)
+	}
+	wg.Wait()
+
+	// Report only the failed records so SQS redelivers those rather than
+	// the whole batch.
+	var resp events.SQSEventResponse
+	for i, err := range errs {
+		if err == nil {
+			continue
 		}
+		messageID := event.Records[i].MessageId
+		slog.Error("record failed", "message_id", messageID, "error", err)
+		resp.BatchItemFailures = append(resp.BatchItemFailures, events.SQSBatchItemFailure{ItemIdentifier: messageID})
 	}
-	return nil
+	return resp, nil
 }
 
-func processRecord(ctx context.Context, db *dynamodb.Client, settings config.Settings, record events.SQSMessage) error {
+func processRecord(ctx context.Context, db itemPutter, record events.SQSMessage, processedAt *types.AttributeValueMemberS) error {
 	var message models.InternalMessage
 	if err := json.Unmarshal([]byte(record.Body), &message); err != nil {
 		return fmt.Errorf("invalid message body: %w", err)
 	}
 
-	// Simulate crash with 5% probability for resilience testing.
-	if rand.Float64() < 0.05 {
-		return errors.New("simulated worker crash")
+	key := itemKey{tenantID: message.TenantID, logID: message.LogID}
+	if stored.contains(key) {
+		slog.Info("duplicate skipped", "tenant_id", message.TenantID, "log_id", message.LogID)
+		return nil
 	}
 
-	// Simulate heavy processing proportional to payload size.
-	sleepDuration := time.Duration(len(message.Text)) * 50 * time.Millisecond
-	time.Sleep(sleepDuration)
+	if simulateLoad {
+		// Simulate crash with 5% probability for resilience testing.
+		if rand.Float64() < 0.05 {
+			return errors.New("simulated worker crash")
+		}
+
+		// Simulate heavy processing proportional to payload size.
+		sleepDuration := time.Duration(len(message.Text)) * 50 * time.Millisecond
+		time.Sleep(sleepDuration)
+
+		// The sleep can run for minutes, so the batch timestamp is stale.
+		processedAt = newProcessedAt()
+	}
 
-	redacted := phonePattern.ReplaceAllString(message.Text, "[REDACTED]")
-	processedAt := time.Now().UTC().Format(time.RFC3339)
+	redacted := redactText(message.Text)
 
 	item := map[string]types.AttributeValue{
 		"tenant_id":     &types.AttributeValueMemberS{Value: message.TenantID},
@@ -66,28 +137,31 @@ func processRecord(ctx context.Context, db *dynamodb.Client, settings config.Set
 		"source":        &types.AttributeValueMemberS{Value: message.Source},
 		"original_text": &types.AttributeValueMemberS{Value: message.Text},
 		"modified_data": &types.AttributeValueMemberS{Value: redacted},
-		"processed_at":  &types.AttributeValueMemberS{Value: processedAt},
+		"processed_at":  processedAt,
 	}
 
 	_, err := db.PutItem(ctx, &dynamodb.PutItemInput{
-		TableName:           stringPtr(settings.DynamoDBTableName),
+		TableName:           &settings.DynamoDBTableName,
 		Item:                item,
-		ConditionExpression: stringPtr("attribute_not_exists(tenant_id) AND attribute_not_exists(log_id)"),
+		ConditionExpression: notExistsCondition,
 	})
 	if err != nil {
 		var cfe *types.ConditionalCheckFailedException
 		if errors.As(err, &cfe) {
-			log.Printf("duplicate detected tenant_id=%s log_id=%s", message.TenantID, message.LogID)
+			slog.Info("duplicate detected", "tenant_id", message.TenantID, "log_id", message.LogID)
+			stored.add(key)
 			return nil
 		}
 		return fmt.Errorf("dynamodb put error: %w", err)
 	}
 
-	log.Printf("persisted tenant_id=%s log_id=%s processed_at=%s", message.TenantID, message.LogID, processedAt)
+	stored.add(key)
+	slog.Info("persisted", "tenant_id", message.TenantID, "log_id", message.LogID, "processed_at", processedAt.Value)
 	return nil
 }
 
-func stringPtr(s string) *string {
-	return &s
+// newProcessedAt returns the current time as a processed_at attribute value.
+func newProcessedAt() *types.AttributeValueMemberS {
+	return &types.AttributeValueMemberS{Value: time.Now().UTC().Format(time.RFC3339)}
 }
 
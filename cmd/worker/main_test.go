@@ -0,0 +1,165 @@
+//go:build !simulate
+
+package main
+
+import (
+	"context"
+	"errors"
+	"sync"
+	"testing"
+
+	"github.com/aws/aws-lambda-go/events"
+	"github.com/aws/aws-sdk-go-v2/aws"
+	"github.com/aws/aws-sdk-go-v2/service/dynamodb"
+	"github.com/aws/aws-sdk-go-v2/service/dynamodb/types"
+
+	"memory-machine/internal/config"
+	"memory-machine/internal/models"
+)
+
+// These tests build without -tags simulate, so simulateLoad is the constant
+// false and processRecord runs the production path: no random crashes or
+// sleeps to patch out, and the tests stay deterministic and parallel-safe.
+
+// fakePutter records PutItem calls and answers them with err.
+type fakePutter struct {
+	mu    sync.Mutex
+	err   error
+	calls []*dynamodb.PutItemInput
+}
+
+func (f *fakePutter) PutItem(ctx context.Context, params *dynamodb.PutItemInput, optFns ...func(*dynamodb.Options)) (*dynamodb.PutItemOutput, error) {
+	f.mu.Lock()
+	defer f.mu.Unlock()
+	f.calls = append(f.calls, params)
+	if f.err != nil {
+		return nil, f.err
+	}
+	return &dynamodb.PutItemOutput{}, nil
+}
+
+// useFakeDB points the container-wide state at a fake client and a fresh
+// idempotency cache for the duration of a test.
+func useFakeDB(t *testing.T, fake *fakePutter) {
+	t.Helper()
+	oldSettings, oldErr, oldDB, oldStored := settings, settingsErr, db, stored
+	settings = config.WorkerSettings{DynamoDBTableName: "tenant-logs"}
+	settingsErr, db, stored = nil, fake, newRecentKeys(maxRecentKeys)
+	t.Cleanup(func() {
+		settings, settingsErr, db, stored = oldSettings, oldErr, oldDB, oldStored
+	})
+}
+
+// sqsRecord builds the body with QueueBody rather than a precomputed payload
+// on purpose: the worker then decodes exactly what the ingest handler
+// enqueues, so a change to the hand-written encoder that the worker cannot
+// read fails here too.
+func sqsRecord(t *testing.T, messageID, tenantID, logID, text string) events.SQSMessage {
+	t.Helper()
+	message := models.NewInternalMessage(tenantID, logID, "json_upload", text)
+	return events.SQSMessage{MessageId: messageID, Body: message.QueueBody()}
+}
+
+func stringAttr(t *testing.T, item map[string]types.AttributeValue, name string) string {
+	t.Helper()
+	value, ok := item[name].(*types.AttributeValueMemberS)
+	if !ok {
+		t.Fatalf("attribute %s = %#v, want a string", name, item[name])
+	}
+	return value.Value
+}
+
+func TestProcessRecordWritesRedactedItem(t *testing.T) {
+	fake := &fakePutter{}
+	useFakeDB(t, fake)
+	processedAt := &types.AttributeValueMemberS{Value: "2024-01-01T00:00:00Z"}
+
+	record := sqsRecord(t, "m1", "acme", "log-1", "User 555-0199 accessed system")
+	if err := processRecord(context.Background(), db, record, processedAt); err != nil {
+		t.Fatalf("processRecord: %v", err)
+	}
+
+	if len(fake.calls) != 1 {
+		t.Fatalf("PutItem called %d times, want 1", len(fake.calls))
+	}
+	input := fake.calls[0]
+	if got := aws.ToString(input.TableName); got != "tenant-logs" {
+		t.Errorf("TableName = %q, want tenant-logs", got)
+	}
+	if input.ConditionExpression != notExistsCondition {
+		t.Errorf("ConditionExpression = %q, want the attribute_not_exists condition", aws.ToString(input.ConditionExpression))
+	}
+	want := map[string]string{
+		"tenant_id":     "acme",
+		"log_id":        "log-1",
+		"source":        "json_upload",
+		"original_text": "User 555-0199 accessed system",
+		"modified_data": "User [REDACTED] accessed system",
+		"processed_at":  "2024-01-01T00:00:00Z",
+	}
+	if len(input.Item) != len(want) {
+		t.Errorf("item has %d attributes, want %d", len(input.Item), len(want))
+	}
+	for name, value := range want {
+		if got := stringAttr(t, input.Item, name); got != value {
+			t.Errorf("%s = %q, want %q", name, got, value)
+		}
+	}
+}
+
+func TestProcessRecordSkipsKnownDuplicates(t *testing.T) {
+	fake := &fakePutter{err: &types.ConditionalCheckFailedException{Message: aws.String("exists")}}
+	useFakeDB(t, fake)
+	processedAt := &types.AttributeValueMemberS{Value: "2024-01-01T00:00:00Z"}
+	record := sqsRecord(t, "m1", "acme", "log-1", "hello")
+
+	// The first delivery learns from DynamoDB that the item exists; the
+	// redelivery is answered from the cache without another PutItem.
+	for i := 0; i < 2; i++ {
+		if err := processRecord(context.Background(), db, record, processedAt); err != nil {
+			t.Fatalf("delivery %d: %v", i+1, err)
+		}
+	}
+	if len(fake.calls) != 1 {
+		t.Fatalf("PutItem called %d times, want 1", len(fake.calls))
+	}
+}
+
+func TestProcessRecordReturnsWriteErrors(t *testing.T) {
+	fake := &fakePutter{err: errors.New("throttled")}
+	useFakeDB(t, fake)
+	processedAt := &types.AttributeValueMemberS{Value: "2024-01-01T00:00:00Z"}
+	record := sqsRecord(t, "m1", "acme", "log-1", "hello")
+
+	for i := 0; i < 2; i++ {
+		if err := processRecord(context.Background(), db, record, processedAt); err == nil {
+			t.Fatalf("delivery %d: got nil error, want the PutItem error", i+1)
+		}
+	}
+	// A failed write must not be cached, so the retry reaches DynamoDB.
+	if len(fake.calls) != 2 {
+		t.Fatalf("PutItem called %d times, want 2", len(fake.calls))
+	}
+}
+
+func TestHandleSQSEventReportsOnlyFailedRecords(t *testing.T) {
+	fake := &fakePutter{}
+	useFakeDB(t, fake)
+	event := events.SQSEvent{Records: []events.SQSMessage{
+		sqsRecord(t, "ok-1", "acme", "log-1", "first"),
+		{MessageId: "bad", Body: "not json"},
+		sqsRecord(t, "ok-2", "beta", "log-2", "second"),
+	}}
+
+	resp, err := handleSQSEvent(context.Background(), event)
+	if err != nil {
+		t.Fatalf("handleSQSEvent: %v", err)
+	}
+	if len(resp.BatchItemFailures) != 1 || resp.BatchItemFailures[0].ItemIdentifier != "bad" {
+		t.Fatalf("BatchItemFailures = %+v, want only the bad record", resp.BatchItemFailures)
+	}
+	if len(fake.calls) != 2 {
+		t.Fatalf("PutItem called %d times, want 2", len(fake.calls))
+	}
+}
+
@@ -0,0 +1,73 @@
+package main
+
+import (
+	"container/list"
+	"sync"
+)
+
+// maxRecentKeys bounds the idempotency cache by entry count, and
+// maxRecentKeyBytes bounds each entry: clients choose tenant and log IDs, and
+// DynamoDB accepts keys of up to 3 KiB. Longer keys are never cached and
+// always take the conditional PutItem path. With keys capped at 128 bytes
+// and about 200 bytes of map and list overhead per entry, a full cache stays
+// under 20 MB of the worker's memory.
+const (
+	maxRecentKeys     = 50000
+	maxRecentKeyBytes = 128
+)
+
+// itemKey identifies a stored log by its DynamoDB primary key.
+type itemKey struct {
+	tenantID string
+	logID    string
+}
+
+// recentKeys is a bounded LRU set of item keys this container already wrote
+// or found in DynamoDB, so redelivered messages skip the conditional PutItem
+// round-trip. It is safe for concurrent use.
+type recentKeys struct {
+	mu      sync.Mutex
+	max     int
+	order   *list.List // most recently used at the front
+	entries map[itemKey]*list.Element
+}
+
+func newRecentKeys(max int) *recentKeys {
+	return &recentKeys{
+		max:     max,
+		order:   list.New(),
+		entries: make(map[itemKey]*list.Element),
+	}
+}
+
+// contains reports whether key was recently recorded and marks it as used.
+func (r *recentKeys) contains(key itemKey) bool {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	elem, ok := r.entries[key]
+	if ok {
+		r.order.MoveToFront(elem)
+	}
+	return ok
+}
+
+// add records key, evicting the least recently used key when full. Keys
+// longer than maxRecentKeyBytes are not recorded.
+func (r *recentKeys) add(key itemKey) {
+	if len(key.tenantID)+len(key.logID) > maxRecentKeyBytes {
+		return
+	}
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	if elem, ok := r.entries[key]; ok {
+		r.order.MoveToFront(elem)
+		return
+	}
+	r.entries[key] = r.order.PushFront(key)
+	if r.order.Len() > r.max {
+		oldest := r.order.Back()
+		r.order.Remove(oldest)
+		delete(r.entries, oldest.Value.(itemKey))
+	}
+}
+
@@ -0,0 +1,45 @@
+package main
+
+import (
+	"strings"
+	"testing"
+)
+
+func TestRecentKeysEvictsLeastRecentlyUsed(t *testing.T) {
+	keys := newRecentKeys(2)
+	a := itemKey{tenantID: "acme", logID: "a"}
+	b := itemKey{tenantID: "acme", logID: "b"}
+	c := itemKey{tenantID: "acme", logID: "c"}
+
+	keys.add(a)
+	keys.add(b)
+	keys.contains(a) // a is now more recently used than b
+	keys.add(c)
+
+	if !keys.contains(a) || !keys.contains(c) {
+		t.Errorf("recently used keys were evicted")
+	}
+	if keys.contains(b) {
+		t.Errorf("least recently used key was kept")
+	}
+}
+
+func TestRecentKeysSkipsOversizedKeys(t *testing.T) {
+	keys := newRecentKeys(maxRecentKeys)
+	atLimit := itemKey{tenantID: "acme", logID: strings.Repeat("x", maxRecentKeyBytes-len("acme"))}
+	tooLong := itemKey{tenantID: strings.Repeat("t", 2048), logID: strings.Repeat("l", 1024)}
+
+	keys.add(atLimit)
+	keys.add(tooLong)
+
+	if !keys.contains(atLimit) {
+		t.Errorf("key of exactly %d bytes was not retained", maxRecentKeyBytes)
+	}
+	if keys.contains(tooLong) {
+		t.Errorf("key of %d bytes was retained", len(tooLong.tenantID)+len(tooLong.logID))
+	}
+	if len(keys.entries) != 1 || keys.order.Len() != 1 {
+		t.Errorf("cache holds %d entries, want 1", len(keys.entries))
+	}
+}
+
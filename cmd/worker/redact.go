@@ -0,0 +1,67 @@
+package main
+
+import "strings"
+
+const redactedPlaceholder = "[REDACTED]"
+
+// isDigit and isWord classify bytes the way regexp's \d and \b do: ASCII
+// digits, and ASCII letters, digits and underscore.
+var isDigit, isWord [256]bool
+
+func init() {
+	for c := 0; c < 256; c++ {
+		isDigit[c] = '0' <= c && c <= '9'
+		isWord[c] = isDigit[c] || 'a' <= c && c <= 'z' || 'A' <= c && c <= 'Z' || c == '_'
+	}
+}
+
+// redactText replaces phone numbers matching \b\d{3}-\d{4}\b with the
+// placeholder. Instead of running a regular expression it jumps between '-'
+// bytes with strings.IndexByte and checks the fixed-width window around each
+// one, yielding the same leftmost, non-overlapping matches.
+func redactText(text string) string {
+	var b strings.Builder
+	copied := 0 // text[:copied] has been written to b
+	for i := 0; i < len(text); {
+		j := strings.IndexByte(text[i:], '-')
+		if j < 0 {
+			break
+		}
+		dash := i + j
+		if !isPhoneAt(text, dash, copied) {
+			i = dash + 1
+			continue
+		}
+		if copied == 0 {
+			b.Grow(len(text))
+		}
+		b.WriteString(text[copied : dash-3])
+		b.WriteString(redactedPlaceholder)
+		copied = dash + 5
+		i = copied
+	}
+	if copied == 0 {
+		return text
+	}
+	b.WriteString(text[copied:])
+	return b.String()
+}
+
+// isPhoneAt reports whether the '-' at text[dash] is the separator of a
+// ddd-dddd number that starts at or after minStart and sits on word
+// boundaries.
+func isPhoneAt(text string, dash, minStart int) bool {
+	start, end := dash-3, dash+5
+	if start < minStart || end > len(text) {
+		return false
+	}
+	if start > 0 && isWord[text[start-1]] {
+		return false
+	}
+	if end < len(text) && isWord[text[end]] {
+		return false
+	}
+	return isDigit[text[start]] && isDigit[text[start+1]] && isDigit[text[start+2]] &&
+		isDigit[text[dash+1]] && isDigit[text[dash+2]] && isDigit[text[dash+3]] && isDigit[text[dash+4]]
+}
+
@@ -0,0 +1,84 @@
+package main
+
+import (
+	"math/rand"
+	"regexp"
+	"testing"
+)
+
+// phonePattern is the regular expression redactText replaced; it serves as
+// the reference implementation the scanner must agree with.
+var phonePattern = regexp.MustCompile(`\b\d{3}-\d{4}\b`)
+
+func TestRedactText(t *testing.T) {
+	tests := []struct {
+		name string
+		in   string
+		want string
+	}{
+		{"empty", "", ""},
+		{"no dash", "user logged in", "user logged in"},
+		{"whole string", "555-0199", "[REDACTED]"},
+		{"start of string", "555-0199 called", "[REDACTED] called"},
+		{"end of string", "call 555-0199", "call [REDACTED]"},
+		{"middle", "User 555-0199 accessed system", "User [REDACTED] accessed system"},
+		{"two numbers", "555-0199, 555-1234", "[REDACTED], [REDACTED]"},
+		{"adjacent via dash", "555-0199-555-1234", "[REDACTED]-[REDACTED]"},
+		{"back to back", "123-4567-8901", "[REDACTED]-8901"},
+		{"us number", "555-123-4567", "555-[REDACTED]"},
+		{"too few leading digits", "55-0199", "55-0199"},
+		{"too few trailing digits", "555-019", "555-019"},
+		{"too many leading digits", "5555-0199", "5555-0199"},
+		{"too many trailing digits", "555-01999", "555-01999"},
+		{"letter before", "a555-0199", "a555-0199"},
+		{"letter after", "555-0199a", "555-0199a"},
+		{"underscore before", "_555-0199", "_555-0199"},
+		{"underscore after", "555-0199_", "555-0199_"},
+		{"punctuation neighbours", "(555-0199).", "([REDACTED])."},
+		{"non-ASCII neighbours", "é555-0199é", "é[REDACTED]é"},
+		{"invalid UTF-8 neighbours", "\xff555-0199\xfe", "\xff[REDACTED]\xfe"},
+		{"non-ASCII digits", "٥٥٥-٠١٩٩", "٥٥٥-٠١٩٩"},
+		{"dashes only", "---", "---"},
+		{"dash at edges", "-555-0199-", "-[REDACTED]-"},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if got := redactText(tt.in); got != tt.want {
+				t.Errorf("redactText(%q) = %q, want %q", tt.in, got, tt.want)
+			}
+			if want := phonePattern.ReplaceAllLiteralString(tt.in, redactedPlaceholder); tt.want != want {
+				t.Errorf("table entry %q disagrees with regexp: %q", tt.in, want)
+			}
+		})
+	}
+}
+
+func TestRedactTextMatchesRegexp(t *testing.T) {
+	// A small alphabet makes phone-shaped runs, boundaries and overlaps
+	// common in random input.
+	alphabet := []byte("0123456789---- a_Z.\xc3\xa9\xff")
+	rng := rand.New(rand.NewSource(1))
+	for n := 0; n < 200000; n++ {
+		buf := make([]byte, rng.Intn(32))
+		for i := range buf {
+			buf[i] = alphabet[rng.Intn(len(alphabet))]
+		}
+		checkAgainstRegexp(t, string(buf))
+	}
+}
+
+func FuzzRedactText(f *testing.F) {
+	for _, seed := range []string{"555-0199", "123-4567-8901", "_555-0199", "\xff555-0199é"} {
+		f.Add(seed)
+	}
+	f.Fuzz(checkAgainstRegexp)
+}
+
+func checkAgainstRegexp(t *testing.T, in string) {
+	t.Helper()
+	want := phonePattern.ReplaceAllLiteralString(in, redactedPlaceholder)
+	if got := redactText(in); got != want {
+		t.Fatalf("redactText(%q) = %q, regexp gives %q", in, got, want)
+	}
+}
+
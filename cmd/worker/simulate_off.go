@@ -0,0 +1,8 @@
+//go:build !simulate
+
+package main
+
+// simulateLoad enables the crash and heavy-processing simulation used for
+// resilience testing. Build with -tags simulate to turn it on; as a constant
+// the compiler drops the simulation code from production binaries.
+const simulateLoad = false
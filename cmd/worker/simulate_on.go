@@ -0,0 +1,5 @@
+//go:build simulate
+
+package main
+
+const simulateLoad = true
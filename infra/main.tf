@@ -209,5 +209,7 @@ resource "aws_lambda_event_source_mapping" "worker_sqs_mapping" {
   event_source_arn = aws_sqs_queue.log_ingest_queue.arn
   function_name    = aws_lambda_function.worker.arn
   batch_size       = 5
+
+  function_response_types = ["ReportBatchItemFailures"]
 }
 
@@ -9,34 +9,80 @@ import (
 	"github.com/aws/aws-sdk-go-v2/config"
 )
 
-// Settings holds resolved configuration and shared AWS config.
-type Settings struct {
+// IngestSettings holds configuration for the ingest Lambda.
+type IngestSettings struct {
+	AWSConfig   aws.Config
+	SQSQueueURL string
+}
+
+// WorkerSettings holds configuration for the worker Lambda.
+type WorkerSettings struct {
 	AWSConfig         aws.Config
-	SQSQueueURL       string
 	DynamoDBTableName string
 }
 
-// Load reads environment variables and AWS configuration.
-func Load(ctx context.Context) (Settings, error) {
-	awsCfg, err := config.LoadDefaultConfig(ctx)
+// LoadIngest reads the environment variables and AWS configuration needed
+// by the ingest Lambda.
+func LoadIngest(ctx context.Context) (IngestSettings, error) {
+	sqsURL, err := requireEnv("SQS_QUEUE_URL")
+	if err != nil {
+		return IngestSettings{}, err
+	}
+
+	awsCfg, err := loadAWSConfig(ctx)
 	if err != nil {
-		return Settings{}, fmt.Errorf("load AWS config: %w", err)
+		return IngestSettings{}, err
 	}
 
-	sqsURL := os.Getenv("SQS_QUEUE_URL")
-	if sqsURL == "" {
-		return Settings{}, fmt.Errorf("missing SQS_QUEUE_URL")
+	return IngestSettings{
+		AWSConfig:   awsCfg,
+		SQSQueueURL: sqsURL,
+	}, nil
+}
+
+// LoadWorker reads the environment variables and AWS configuration needed
+// by the worker Lambda.
+func LoadWorker(ctx context.Context) (WorkerSettings, error) {
+	tableName, err := requireEnv("DYNAMODB_TABLE_NAME")
+	if err != nil {
+		return WorkerSettings{}, err
 	}
 
-	tableName := os.Getenv("DYNAMODB_TABLE_NAME")
-	if tableName == "" {
-		return Settings{}, fmt.Errorf("missing DYNAMODB_TABLE_NAME")
+	// Adaptive retries add client-side rate limiting when DynamoDB throttles,
+	// so a burst of concurrent writes backs off instead of retrying blindly.
+	awsCfg, err := loadAWSConfig(ctx, config.WithRetryMode(aws.RetryModeAdaptive))
+	if err != nil {
+		return WorkerSettings{}, err
 	}
 
-	return Settings{
+	return WorkerSettings{
 		AWSConfig:         awsCfg,
-		SQSQueueURL:       sqsURL,
 		DynamoDBTableName: tableName,
 	}, nil
 }
 
+func requireEnv(name string) (string, error) {
+	value := os.Getenv(name)
+	if value == "" {
+		return "", fmt.Errorf("missing %s", name)
+	}
+	return value, nil
+}
+
+func loadAWSConfig(ctx context.Context, opts ...func(*config.LoadOptions) error) (aws.Config, error) {
+	if os.Getenv("AWS_LAMBDA_FUNCTION_NAME") != "" {
+		// Lambda injects region and credentials as environment variables, so
+		// skip probing for ~/.aws/config and ~/.aws/credentials on cold start.
+		opts = append(opts,
+			config.WithSharedConfigFiles([]string{}),
+			config.WithSharedCredentialsFiles([]string{}),
+		)
+	}
+
+	awsCfg, err := config.LoadDefaultConfig(ctx, opts...)
+	if err != nil {
+		return aws.Config{}, fmt.Errorf("load AWS config: %w", err)
+	}
+	return awsCfg, nil
+}
+
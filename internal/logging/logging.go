@@ -0,0 +1,22 @@
+package logging
+
+import (
+	"log/slog"
+	"os"
+)
+
+// Setup installs a JSON logger as the slog default. Each record is a single
+// line whose fields CloudWatch Logs Insights can query directly. The time
+// attribute is dropped because Lambda already timestamps every log line.
+func Setup() {
+	handler := slog.NewJSONHandler(os.Stdout, &slog.HandlerOptions{
+		ReplaceAttr: func(groups []string, a slog.Attr) slog.Attr {
+			if len(groups) == 0 && a.Key == slog.TimeKey {
+				return slog.Attr{}
+			}
+			return a
+		},
+	})
+	slog.SetDefault(slog.New(handler))
+}
+
@@ -0,0 +1,110 @@
+package models
+
+import (
+	"strings"
+	"time"
+	"unicode/utf8"
+)
+
+// QueueBody encodes the message as the JSON document sent to SQS. The output
+// decodes to the same value as json.Marshal(m) but is written directly into
+// a pre-sized buffer instead of going through reflection.
+func (m InternalMessage) QueueBody() string {
+	var b strings.Builder
+	b.Grow(len(m.TenantID) + len(m.LogID) + len(m.Source) + len(m.Text) + 128)
+
+	b.WriteString(`{"tenant_id":`)
+	writeJSONString(&b, m.TenantID)
+	b.WriteString(`,"log_id":`)
+	writeJSONString(&b, m.LogID)
+	b.WriteString(`,"source":`)
+	writeJSONString(&b, m.Source)
+	b.WriteString(`,"text":`)
+	writeJSONString(&b, m.Text)
+	b.WriteString(`,"received_at":"`)
+	var ts [64]byte
+	b.Write(m.ReceivedAt.AppendFormat(ts[:0], time.RFC3339Nano))
+	b.WriteString(`"}`)
+
+	return b.String()
+}
+
+// Body encodes the response as the JSON document returned to the client,
+// matching json.Marshal(r) without reflection.
+func (r EnqueueResponse) Body() string {
+	var b strings.Builder
+	b.Grow(len(r.Status) + len(r.TenantID) + len(r.LogID) + 48)
+
+	b.WriteString(`{"status":`)
+	writeJSONString(&b, r.Status)
+	b.WriteString(`,"tenant_id":`)
+	writeJSONString(&b, r.TenantID)
+	b.WriteString(`,"log_id":`)
+	writeJSONString(&b, r.LogID)
+	b.WriteByte('}')
+
+	return b.String()
+}
+
+// Body encodes the error as the JSON document returned to the client,
+// matching json.Marshal(e) without reflection.
+func (e ErrorResponse) Body() string {
+	var b strings.Builder
+	b.Grow(len(e.Error) + 16)
+
+	b.WriteString(`{"error":`)
+	writeJSONString(&b, e.Error)
+	b.WriteByte('}')
+
+	return b.String()
+}
+
+const hexDigits = "0123456789abcdef"
+
+// writeJSONString writes s as a quoted JSON string, escaping quotes,
+// backslashes and control characters and replacing invalid UTF-8 with
+// U+FFFD as encoding/json does.
+func writeJSONString(b *strings.Builder, s string) {
+	b.WriteByte('"')
+	start := 0
+	for i := 0; i < len(s); {
+		c := s[i]
+		if c < utf8.RuneSelf {
+			if c >= 0x20 && c != '"' && c != '\\' {
+				i++
+				continue
+			}
+			b.WriteString(s[start:i])
+			switch c {
+			case '"', '\\':
+				b.WriteByte('\\')
+				b.WriteByte(c)
+			case '\n':
+				b.WriteString(`\n`)
+			case '\r':
+				b.WriteString(`\r`)
+			case '\t':
+				b.WriteString(`\t`)
+			default:
+				b.WriteString(`\u00`)
+				b.WriteByte(hexDigits[c>>4])
+				b.WriteByte(hexDigits[c&0xF])
+			}
+			i++
+			start = i
+			continue
+		}
+		r, size := utf8.DecodeRuneInString(s[i:])
+		if r == utf8.RuneError && size == 1 {
+			b.WriteString(s[start:i])
+			b.WriteString(`\ufffd`)
+			i += size
+			start = i
+			continue
+		}
+		i += size
+	}
+	b.WriteString(s[start:])
+	b.WriteByte('"')
+}
+
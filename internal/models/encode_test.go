@@ -0,0 +1,90 @@
+package models
+
+import (
+	"encoding/json"
+	"math/rand"
+	"testing"
+	"time"
+)
+
+var trickyStrings = []string{
+	"",
+	"plain text",
+	`quote " inside`,
+	`back\slash`,
+	"new\nline, tab\t and carriage\rreturn",
+	"control \x00\x01\x1f\x7f bytes",
+	"invalid \xff\xfe UTF-8 and truncated \xe2\x82",
+	"line separators \u2028 and \u2029",
+	"html <script>&amp;</script>",
+	"non-ASCII é 日本 🎉",
+}
+
+// decodesLikeMarshal checks that encoded is valid JSON that decodes to the
+// same value as json.Marshal(v).
+func decodesLikeMarshal[T comparable](t *testing.T, v T, encoded string) {
+	t.Helper()
+	want, err := json.Marshal(v)
+	if err != nil {
+		t.Fatalf("json.Marshal(%+v): %v", v, err)
+	}
+	var got, fromMarshal T
+	if err := json.Unmarshal([]byte(encoded), &got); err != nil {
+		t.Fatalf("invalid JSON %q: %v", encoded, err)
+	}
+	if err := json.Unmarshal(want, &fromMarshal); err != nil {
+		t.Fatalf("json.Unmarshal(%q): %v", want, err)
+	}
+	if got != fromMarshal {
+		t.Fatalf("%q decodes to %+v, json.Marshal output %q decodes to %+v", encoded, got, want, fromMarshal)
+	}
+}
+
+func TestQueueBody(t *testing.T) {
+	receivedAt := time.Date(2024, 1, 2, 3, 4, 5, 678900000, time.UTC)
+	for _, s := range trickyStrings {
+		m := InternalMessage{TenantID: s, LogID: s, Source: "json_upload", Text: s, ReceivedAt: receivedAt}
+		decodesLikeMarshal(t, m, m.QueueBody())
+	}
+}
+
+func TestQueueBodyRandom(t *testing.T) {
+	rng := rand.New(rand.NewSource(1))
+	for n := 0; n < 20000; n++ {
+		m := NewInternalMessage(randomString(rng), randomString(rng), "text_upload", randomString(rng))
+		m.ReceivedAt = time.Unix(rng.Int63n(1e10), rng.Int63n(1e9)).UTC()
+		decodesLikeMarshal(t, m, m.QueueBody())
+	}
+}
+
+func TestEnqueueResponseBody(t *testing.T) {
+	for _, s := range trickyStrings {
+		r := EnqueueResponse{Status: "enqueued", TenantID: s, LogID: s}
+		decodesLikeMarshal(t, r, r.Body())
+	}
+}
+
+func TestErrorResponseBody(t *testing.T) {
+	for _, s := range trickyStrings {
+		e := ErrorResponse{Error: s}
+		decodesLikeMarshal(t, e, e.Body())
+	}
+}
+
+// randomString mixes arbitrary bytes, low control bytes and letters so that
+// escapes and invalid UTF-8 appear often.
+func randomString(rng *rand.Rand) string {
+	buf := make([]byte, rng.Intn(40))
+	for i := range buf {
+		switch rng.Intn(4) {
+		case 0:
+			buf[i] = byte(rng.Intn(256))
+		case 1:
+			buf[i] = byte(rng.Intn(0x30))
+		default:
+			buf[i] = byte('a' + rng.Intn(26))
+		}
+	}
+	return string(buf)
+}
+
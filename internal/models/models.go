@@ -27,6 +27,11 @@ type EnqueueResponse struct {
 	LogID    string `json:"log_id"`
 }
 
+// ErrorResponse is returned when a request is rejected.
+type ErrorResponse struct {
+	Error string `json:"error"`
+}
+
 // NewInternalMessage builds a normalized message with a UTC timestamp.
 func NewInternalMessage(tenantID, logID, source, text string) InternalMessage {
 	return InternalMessage{